@@ -1,9 +1,15 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import difflib
 import joblib
+import json
+import os
 import random
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
 
 # ==============================
@@ -11,10 +17,29 @@ import re
 # ==============================
 # Define columns required for the app's features to work
 REQUIRED_COLUMNS = [
-    'Brand', 'Model', 'Estimated_US_Value', 'km_of_range', 'Battery', 
+    'Brand', 'Model', 'Estimated_US_Value', 'km_of_range', 'Battery',
     '0-100', 'Top_Speed', 'Efficiency', 'Number_of_seats', 'Towing_capacity_in_kg'
 ]
 
+# Default dataset and its Parquet sidecar cache (avoids re-parsing the CSV on cold starts)
+DEFAULT_CSV = 'cars_data_cleaned.csv'
+PARQUET_CACHE = 'cars_data_cleaned.parquet'
+PARQUET_META = 'cars_data_cleaned.meta.json'
+
+# Explicit schema for the default CSV: parse only the columns the app uses,
+# skip type inference, and keep numerics at 32 bits (seats are whole
+# numbers — an integer dtype keeps widget labels at '5', not '5.0')
+DEFAULT_CSV_DTYPES = {
+    'Brand': 'string', 'Model': 'string',
+    'Estimated_US_Value': 'float32', 'km_of_range': 'float32', 'Battery': 'float32',
+    '0-100': 'float32', 'Top_Speed': 'float32', 'Efficiency': 'float32',
+    'Number_of_seats': 'int16', 'Towing_capacity_in_kg': 'float32',
+}
+
+# Bumped whenever the normalized schema changes, so a sidecar written by
+# an older app version is rebuilt instead of reused
+PARQUET_SCHEMA_VERSION = 2
+
 # ==============================
 # Page Configuration
 # ==============================
@@ -40,18 +65,118 @@ model = load_model()
 # Data Loading & Processing
 # ==============================
 
-@st.cache_data
+@st.cache_resource(show_spinner=False)
 def load_default_data():
-    """Loads the default CSV file."""
+    """
+    Loads the default dataset, already normalized.
+    Prefers the Parquet sidecar cache when it is still fresh (mtime-validated);
+    falls back to parsing the CSV and refreshes the cache afterwards.
+
+    Cached as a resource: one frame is shared read-only across all
+    sessions instead of being copied out of the data cache per access.
+    Nothing in the app mutates it in place.
+    """
     try:
-        return pd.read_csv('cars_data_cleaned.csv')
-    except FileNotFoundError:
-        st.error("Default data file 'cars_data_cleaned.csv' not found.")
+        csv_mtime = os.path.getmtime(DEFAULT_CSV)
+    except OSError:
+        st.error(f"Default data file '{DEFAULT_CSV}' not found.")
         return pd.DataFrame()
+
+    # Try the Parquet cache first (much faster than re-parsing CSV)
+    try:
+        if os.path.exists(PARQUET_CACHE) and os.path.exists(PARQUET_META):
+            with open(PARQUET_META) as f:
+                meta = json.load(f)
+            if meta.get('csv_mtime') == csv_mtime and meta.get('schema') == PARQUET_SCHEMA_VERSION:
+                df = pd.read_parquet(PARQUET_CACHE, engine='pyarrow')
+                # Not every pandas/pyarrow pairing restores category
+                # dtypes from Parquet; re-apply the casts so warm loads
+                # match the schema normalize_dataframe produces
+                for col in ('Brand', 'Number_of_seats'):
+                    if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                        df[col] = df[col].astype('category')
+                return df
+    except Exception:
+        pass  # Stale or unreadable cache; fall through to the CSV
+
+    try:
+        df = normalize_dataframe(pd.read_csv(
+            DEFAULT_CSV, usecols=list(DEFAULT_CSV_DTYPES), dtype=DEFAULT_CSV_DTYPES,
+            engine='pyarrow'
+        ))
     except Exception as e:
         st.error(f"Error loading default data: {e}")
         return pd.DataFrame()
 
+    # Refresh the cache (best-effort: the app works fine without it)
+    try:
+        df.to_parquet(PARQUET_CACHE, engine='pyarrow', compression='zstd')
+        with open(PARQUET_META, 'w') as f:
+            json.dump({'csv_mtime': csv_mtime, 'schema': PARQUET_SCHEMA_VERSION}, f)
+    except Exception:
+        pass
+
+    return df
+
+# The search-key normalization rule, applied column-wise at load time and
+# (via the precompiled regexes) to single query strings at chat time
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize_key_array(arr):
+    """Lowercases and normalizes an Arrow string array into a search key."""
+    arr = pc.utf8_lower(arr)
+    arr = pc.replace_substring_regex(arr, _NON_ALNUM_RE.pattern, '')
+    return pc.replace_substring_regex(arr, _WHITESPACE_RE.pattern, ' ')
+
+def normalize_query_key(query):
+    """Normalizes one query string with the same rule the search keys use."""
+    return _WHITESPACE_RE.sub(' ', _NON_ALNUM_RE.sub('', query.lower().strip()))
+
+def normalize_dataframe(df):
+    """
+    Applies the standard normalization: uppercase brands, stripped model
+    names, and the precomputed search keys used by the chatbot.
+    """
+    processed_df = df.copy()
+    # --- All brand data is UPPERCASE ---
+    processed_df['Brand'] = processed_df['Brand'].str.upper()
+    processed_df['Model'] = processed_df['Model'].str.strip()
+
+    # Create robust search keys via Arrow compute kernels (single C-level
+    # pass per transform instead of pandas' per-element string ops)
+    brand_arr = pa.array(processed_df['Brand'], type=pa.string())
+    model_arr = pa.array(processed_df['Model'], type=pa.string())
+    search_arr = pc.binary_join_element_wise(brand_arr, model_arr, ' ')
+    processed_df['Model_Key'] = _normalize_key_array(model_arr).to_pandas().to_numpy()
+    processed_df['Search_Key'] = _normalize_key_array(search_arr).to_pandas().to_numpy()
+
+    # Compact numeric dtypes: halves the bytes every later scan and
+    # reduction touches (the default CSV already reads as float32; this
+    # brings uploaded files to the same schema)
+    for col in REQUIRED_COLUMNS:
+        if col in ('Brand', 'Model'):
+            continue
+        # Seats stay integer so '5' doesn't render as '5.0' (falls back
+        # to float automatically if an upload has missing seat values)
+        downcast = 'integer' if col == 'Number_of_seats' else 'float'
+        processed_df[col] = pd.to_numeric(processed_df[col], downcast=downcast)
+
+    # Arrow-backed strings: .str operations (notably the contains fallback
+    # in find_car) dispatch to Arrow's C++ kernels instead of iterating
+    # Python string objects, and memory stays in contiguous UTF-8 buffers
+    for col in ('Model', 'Model_Key', 'Search_Key'):
+        processed_df[col] = processed_df[col].astype('string[pyarrow]')
+
+    # Categorical brands: filters/groupbys compare integer codes instead of
+    # Python strings, and the column shrinks to ~1 byte per row
+    processed_df['Brand'] = processed_df['Brand'].astype('category')
+    # Seats take a handful of distinct values, so the seat filter's isin
+    # also gets the integer-code treatment
+    processed_df['Number_of_seats'] = processed_df['Number_of_seats'].astype('category')
+
+    return processed_df
+
 def process_dataframe(df):
     """
     Checks, validates, and processes a DataFrame.
@@ -71,55 +196,379 @@ def process_dataframe(df):
     # If all columns are present, proceed with processing
     st.session_state.data_valid = True
     try:
-        processed_df = df.copy()
-        # --- All brand data is UPPERCASE ---
-        processed_df['Brand'] = processed_df['Brand'].str.upper() 
-        processed_df['Model'] = processed_df['Model'].str.strip()
-        
-        # Create robust search keys
-        processed_df['Model_Key'] = processed_df['Model'].str.lower().str.replace(r'[^a-z0-9\s]', '', regex=True).str.replace(r'\s+', ' ', regex=True)
-        processed_df['Search_Key'] = (processed_df['Brand'].str.lower() + ' ' + processed_df['Model'].str.lower()).str.replace(r'[^a-z0-9\s]', '', regex=True).str.replace(r'\s+', ' ', regex=True)
-        
-        return processed_df
+        if 'Search_Key' in df.columns:
+            # Already normalized (e.g. loaded from the Parquet cache)
+            return df
+        return normalize_dataframe(df)
     except Exception as e:
         st.error(f"Error processing DataFrame: {e}")
         st.session_state.data_valid = False
         return df
 
 # ==============================
-# Helper Function
+# Precomputed Lookups
 # ==============================
+def _nan_argext(values, reducer):
+    """
+    NaN-skipping argmax/argmin as a positional int, or None when the
+    column holds no finite values — matching the idxmax/idxmin semantics
+    the per-brand tables get from pandas.
+    """
+    if np.isnan(values).all():
+        return None
+    return int(reducer(values))
+
+@st.cache_data
+def compute_extrema(df):
+    """
+    Precomputes the positional indices of the global extremes the chatbot
+    cares about, so "longest range"-style queries become O(1) lookups
+    instead of full column scans on every message. Works on raw NumPy
+    arrays to skip the pandas reduction machinery for the one-off scan.
+    """
+    price = df['Estimated_US_Value'].to_numpy()
+    priced_pos = np.flatnonzero(price > 0)
+    return {
+        'longest_range': _nan_argext(df['km_of_range'].to_numpy(), np.nanargmax),
+        'cheapest': int(priced_pos[price[priced_pos].argmin()]) if priced_pos.size else None,
+        'fastest': _nan_argext(df['0-100'].to_numpy(), np.nanargmin),
+        'towing': _nan_argext(df['Towing_capacity_in_kg'].to_numpy(), np.nanargmax),
+    }
+
+@st.cache_data
+def compute_brand_extrema(df):
+    """
+    Per-brand extremum row labels from one pass of grouped reductions, so
+    brand-scoped "longest range Porsche" queries skip the subframe scan.
+    Cheapest honors the price > 0 rule used everywhere else, so brands
+    with no priced cars are simply absent from that table.
+    """
+    grouped = df.groupby('Brand', observed=True)
+    priced = df[df['Estimated_US_Value'] > 0]
+    return {
+        'range': grouped['km_of_range'].idxmax().to_dict(),
+        'cheapest': priced.groupby('Brand', observed=True)['Estimated_US_Value'].idxmin().to_dict(),
+        'fastest': grouped['0-100'].idxmin().to_dict(),
+        'towing': grouped['Towing_capacity_in_kg'].idxmax().to_dict(),
+    }
+
+@st.cache_data
+def compute_brand_indices(df):
+    """
+    Maps each brand to the positional indices of its rows. A dict probe +
+    .take() replaces the full-column `df['Brand'] == name` equality scan
+    that used to run on every brand-scoped query.
+    """
+    return df.groupby('Brand', sort=False, observed=True).indices
+
+@st.cache_data
+def compile_brand_pattern(df):
+    """
+    Compiles one alternation regex over all brand names (longest first, so
+    e.g. 'BMW ALPINA' wins over 'BMW'). Brand detection becomes a single
+    scan of the query instead of a substring test per brand.
+    """
+    brands = sorted((b.lower() for b in df['Brand'].unique()), key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, brands)))
+
+@st.cache_data
+def get_brand_lookup(df):
+    """
+    Cached canonical brand tuple plus a lowercase -> canonical map, so
+    brand detection never rebuilds lists from the Brand column per query.
+    """
+    brands = tuple(df['Brand'].unique())
+    return brands, {b.lower(): b for b in brands}
+
+@st.cache_data
+def compute_summary_stats(df):
+    """Dataset-level aggregates for the summary intent, computed once."""
+    price = df['Estimated_US_Value']
+    rng = df['km_of_range']
+    return {
+        'total': len(df),
+        'brands': int(df['Brand'].nunique()),
+        'avg_price': float(price.mean()),
+        'avg_range': float(rng.mean()),
+        'avg_battery': float(df['Battery'].mean()),
+        'price_min': float(price.min()), 'price_max': float(price.max()),
+        'range_min': float(rng.min()), 'range_max': float(rng.max()),
+    }
+
+@st.cache_data
+def compute_filter_options(df):
+    """
+    Sorted option lists for the visualization filter widgets (priced cars
+    only, like the charts). Pure functions of the dataset, so they are
+    computed once instead of on every slider drag.
+    """
+    priced = df[df['Estimated_US_Value'] > 0]
+    return {
+        'brands': sorted(priced['Brand'].unique()),
+        'seats': sorted(priced['Number_of_seats'].unique()),
+        'price': (int(priced['Estimated_US_Value'].min()), int(priced['Estimated_US_Value'].max())),
+        'range': (int(priced['km_of_range'].min()), int(priced['km_of_range'].max())),
+    }
+
+@st.cache_data
+def compute_brand_stats(df):
+    """
+    Per-brand aggregate table computed with one groupby; brand summaries
+    become a single .loc row lookup instead of five reductions over the
+    brand subframe.
+    """
+    return df.groupby('Brand', observed=True).agg(
+        Models=('Model', 'size'),
+        Avg_Price=('Estimated_US_Value', 'mean'),
+        Avg_Range=('km_of_range', 'mean'),
+        Best_Range=('km_of_range', 'max'),
+        Cheapest=('Estimated_US_Value', 'min'),
+        Priciest=('Estimated_US_Value', 'max'),
+        Fastest=('0-100', 'min'),
+    )
+
+@st.cache_data
+def build_car_index(df):
+    """
+    Exact-match hash maps from the normalized search keys to positional
+    row indices. First occurrence wins, matching the old .iloc[0] pick.
+    """
+    search_index = {}
+    model_index = {}
+    # Rows with a missing Brand/Model produce NA keys; leave them out so
+    # the substring and fuzzy fallbacks only ever see real strings (the
+    # old .str.contains(..., na=False) dropped them the same way)
+    for i, (search_key, model_key) in enumerate(zip(df['Search_Key'], df['Model_Key'])):
+        if pd.notna(search_key):
+            search_index.setdefault(search_key, i)
+        if pd.notna(model_key):
+            model_index.setdefault(model_key, i)
+    return search_index, model_index
+
+@st.cache_data
+def compute_static_responses(df):
+    """
+    Pre-renders the chatbot answers that are constant for a given dataset
+    (brand list, model count), so those intents return a stored string
+    with no pandas work at all.
+    """
+    brands = sorted(df['Brand'].unique())
+    return {
+        'brands': f"**Available Brands** ({len(brands)}):  \n`{', '.join(brands)}`",
+        'count': f"There are **{len(df)} EV models** in the database from **{len(brands)} brands**.",
+    }
+
+# ==============================
+# Helper Functions
+# ==============================
+def find_brands_in_query(q, df):
+    """
+    Returns the canonical brands mentioned in the query, deduped in query
+    order. One pass of the cached alternation pattern over the query; no
+    per-call lists are built from the Brand column.
+    """
+    _, brand_map = get_brand_lookup(df)
+    found = []
+    for match in compile_brand_pattern(df).finditer(q):
+        brand = brand_map.get(match.group())
+        if brand and brand not in found:
+            found.append(brand)
+    return found
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def filter_viz_df(df, sel_brands, sel_price, sel_range, sel_seats):
+    """
+    Applies the visualization filters: the membership tests stay as
+    vectorized isin masks (query can't express them efficiently), while
+    the priced-cars predicate and both range bounds go to DataFrame.query
+    as one conjoined expression, which pandas evaluates in a single fused
+    pass (through numexpr when it is installed).
+
+    Cached on the selection tuple: reruns with unchanged filters (tab
+    switches, chat input, etc.) reuse the previous filtered frame.
+    """
+    member = df['Brand'].isin(sel_brands).to_numpy() & df['Number_of_seats'].isin(sel_seats).to_numpy()
+    p_lo, p_hi = sel_price
+    r_lo, r_hi = sel_range
+    return df[member].query(
+        'Estimated_US_Value > 0'
+        ' and @p_lo <= Estimated_US_Value <= @p_hi'
+        ' and @r_lo <= km_of_range <= @r_hi'
+    )
+
+def top_k_rows(df, column, k=10):
+    """
+    Rows holding the k largest values of `column`, largest first.
+    argpartition selects the top k in one pass over the raw array, then
+    only those k get sorted — cheaper than nlargest's partial sort plus
+    pandas dispatch.
+    """
+    values = df[column].to_numpy()
+    if len(values) > k:
+        keep = np.argpartition(values, -k)[-k:]
+    else:
+        keep = np.arange(len(values))
+    order = keep[np.argsort(values[keep])[::-1]]
+    return df.iloc[order]
+
 def find_car(query, df):
     """
     Finds the best match for a car query in the *provided* dataframe.
+    Exact matches resolve through the cached key index in O(1); substring
+    matching stays as the fallback.
     """
     if df.empty or not st.session_state.get('data_valid', False):
         return None
-        
-    q_norm = query.lower().strip().replace(r'[^a-z0-9\s]', '', regex=True).replace(r'\s+', ' ', regex=True)
-    
-    # 1. Try exact match on 'Brand Model'
-    exact_match = df[df['Search_Key'] == q_norm]
-    if not exact_match.empty:
-        return exact_match.iloc[0]
-        
-    # 2. Try exact match on 'Model' only
-    exact_model_match = df[df['Model_Key'] == q_norm]
-    if not exact_model_match.empty:
-        return exact_model_match.iloc[0]
-        
-    # 3. Try contains match on 'Brand Model'
-    contains_match = df[df['Search_Key'].str.contains(q_norm, na=False)]
-    if not contains_match.empty:
-        return contains_match.iloc[0]
-        
-    # 4. Try contains match on 'Model' only
-    contains_model_match = df[df['Model_Key'].str.contains(q_norm, na=False)]
-    if not contains_model_match.empty:
-        return contains_model_match.iloc[0]
-        
+
+    q_norm = normalize_query_key(query)
+
+    # 1./2. Try exact match on 'Brand Model', then on 'Model' only
+    search_index, model_index = build_car_index(df)
+    idx = search_index.get(q_norm)
+    if idx is None:
+        idx = model_index.get(q_norm)
+    if idx is not None:
+        return df.iloc[idx]
+
+    # 3./4. Substring match on 'Brand Model', then on 'Model' only: scan
+    # the cached key maps (insertion order = row order, so the first hit
+    # is the same row .str.contains(...).iloc[0] used to pick) instead of
+    # materializing a filtered frame just to take its first row
+    for index in (search_index, model_index):
+        for key, i in index.items():
+            if q_norm in key:
+                return df.iloc[i]
+
+    # 5. Fuzzy fallback over the cached keys: catches near-miss spellings
+    # like 'modle y' that substring matching gives up on
+    for index in (search_index, model_index):
+        close = difflib.get_close_matches(q_norm, index, n=1, cutoff=0.75)
+        if close:
+            return df.iloc[index[close[0]]]
+
     return None
 
+# ==============================
+# Chatbot Intent Handlers
+# ==============================
+# Dedicated RNG plus index-based picking: skips the global-module attribute
+# lookup and length capture hidden inside random.choice on the hot path
+_RNG = random.Random()
+
+def _pick(templates):
+    return templates[_RNG.randrange(len(templates))]
+
+# Varied-reply templates frozen as module tuples so no throwaway list is
+# built per message; {src} is filled with the active data source where used
+GREETING_TEMPLATES = (
+    "Hey there! Ready to dive into the world of EVs?",
+    "Hi! I'm ready to answer questions about the **{src}** dataset. What's on your mind?",
+    "Hello! What EV are you dreaming about today?"
+)
+
+THANKS_TEMPLATES = (
+    "You're welcome! Charge safe!", "Happy to help!", "See you next time!"
+)
+
+FALLBACK_TEMPLATES = (
+    "I'm not sure I understand. I'm best at specific questions! Try asking for:\n"
+    "• *compare Tesla vs BMW*\n"
+    "• *tell me about Model Y*\n"
+    "• *longest range Porsche*",
+
+    "Hmm, I didn't catch that. You can ask me to **compare cars**, **summarize a model**, or find the **best/cheapest** car.",
+
+    "Sorry, I couldn't process that. Remember, I'm an EV expert! Try asking about the **{src}** data, like:\n"
+    "• *show summary*\n"
+    "• *how many cars are there?*\n"
+    "• *cheapest car*"
+)
+
+def _handle_greeting(q, df):
+    return _pick(GREETING_TEMPLATES).format(src=st.session_state.data_source)
+
+def _handle_fallback(q, df):
+    return _pick(FALLBACK_TEMPLATES).format(src=st.session_state.data_source)
+
+# One word-bounded scan per category instead of a Python-level substring
+# test per phrase; the \b anchors also stop fragments inside longer words
+# ('which' no longer reads as a greeting, 'byte' no longer says goodbye).
+GREET_RE = re.compile(r'\b(?:hi|hello|hey|yo|howdy|greetings)\b')
+HELP_RE = re.compile(r'\bhelp\b|what can you|who are you|\binfo\b|what do you do')
+THANKS_RE = re.compile(r'\b(?:thanks|thank you|thankyou|bye|goodbye|see you)\b')
+BRANDS_LIST_RE = re.compile(r'brand.*(?:list|all|available|show)|(?:list|all|available|show).*brand')
+
+# Tags the extremum intent in one scan instead of ~10 substring checks.
+# Alternatives cover both word orders to keep the old any-order semantics.
+EXTREME_RE = re.compile(
+    r'(?P<range>(?:longest|most|best).*range|range.*(?:longest|most|best))|'
+    r'(?P<cheapest>cheapest|lowest.*price|price.*lowest)|'
+    r'(?P<fastest>(?:fastest|quickest).*(?:0-100|acceleration)|(?:0-100|acceleration).*(?:fastest|quickest))|'
+    r'(?P<towing>towing.*(?:most|highest|best|max)|(?:most|highest|best|max).*towing)'
+)
+
+# Pre-parsed positional templates for the extremum answers (the format
+# specs are parsed once here, not per reply)
+RANGE_TMPL = "{0}, the **{1} {2}** has the longest range: **{3:.0f} km**."
+CHEAPEST_TMPL = "{0}, the cheapest is **{1} {2}** at **${3:,.0f}**."
+FASTEST_TMPL = "{0}, the fastest 0-100 is **{1} {2}** in **{3:.1f} sec**."
+TOWING_TMPL = "{0}, the **{1} {2}** tows the most: **{3:.0f} kg**."
+
+# Fully static responses, built once at import time
+HELP_TEXT = (
+    "I'm your **EV Assistant**! Here's what I can do:\n\n"
+    "• **Compare cars**: *compare Tesla Model 3 vs BMW i4*\n"
+    "• **Compare brands**: *Tesla vs BMW*\n"
+    "• **Car summary**: *tell me about Lucid Air*\n"
+    "• **Best in class**: *longest range*, *cheapest car*, *fastest 0-100*\n"
+    "• **Brand stats**: *best Tesla for towing*, *cheapest Porsche*\n"
+    "• **Dataset info**: *show summary*, *how many cars?*\n"
+    "• **List brands**: *brands*\n\n"
+    "Try any of these!"
+)
+
+WELCOME_MESSAGE = (
+    "Hi! I'm your **EV Expert**\n\n"
+    "I'm ready to answer questions about the active dataset.\n"
+    "• Try: *Tesla vs BMW*\n"
+    "• Try: *compare Model 3 vs i4*\n"
+    "• Try: *longest range*"
+)
+
+def _handle_help(q, df):
+    return HELP_TEXT
+
+def _handle_thanks(q, df):
+    return _pick(THANKS_TEMPLATES)
+
+def _handle_brand_list(q, df):
+    return compute_static_responses(df)['brands']
+
+def _handle_count(q, df):
+    return compute_static_responses(df)['count']
+
+# Exact-match queries resolve with a single dict probe before any of the
+# substring-based routing below runs.
+EXACT_INTENTS = {
+    'hi': _handle_greeting, 'hello': _handle_greeting, 'hey': _handle_greeting,
+    'yo': _handle_greeting, 'howdy': _handle_greeting, 'greetings': _handle_greeting,
+    'help': _handle_help,
+    'thanks': _handle_thanks, 'thank you': _handle_thanks, 'thankyou': _handle_thanks,
+    'bye': _handle_thanks, 'goodbye': _handle_thanks,
+    'brands': _handle_brand_list, 'list brands': _handle_brand_list,
+    'all brands': _handle_brand_list, 'show brands': _handle_brand_list,
+    'how many cars': _handle_count, 'how many evs': _handle_count,
+}
+
+# Ordered dispatch table for the data-independent intents: the first
+# pattern that matches wins, so a query touches at most one handler and
+# the pattern order preserves the old branch precedence.
+INTENT_TABLE = (
+    (GREET_RE, _handle_greeting),
+    (HELP_RE, _handle_help),
+    (THANKS_RE, _handle_thanks),
+)
+
 # ==============================
 # Chatbot Logic (Corrected & Improved)
 # ==============================
@@ -133,86 +582,86 @@ def process_query(query, df):
     q = query.lower().strip()
     original_q = query.strip()
 
+    # --- Cheap prefilter: bail on degenerate input before any routing ---
+    if not q or len(q) > 200:
+        return _handle_fallback(q, df)
+    if not q.isascii():
+        # The data and all intents are ASCII; dropping other characters
+        # still lets e.g. "tesla 🚗" match
+        q = q.encode('ascii', 'ignore').decode()
+
+    # --- Exact-match dispatch (single dict probe) ---
+    handler = EXACT_INTENTS.get(q)
+    if handler:
+        return handler(q, df)
+
     # --- Standard Greetings/Help (Data-independent) ---
-    if any(g in q for g in ["hi", "hello", "hey", "yo", "howdy", "greetings"]):
-        return random.choice([
-            "Hey there! Ready to dive into the world of EVs?",
-            f"Hi! I'm ready to answer questions about the **{st.session_state.data_source}** dataset. What's on your mind?",
-            "Hello! What EV are you dreaming about today?"
-        ])
-    
-    if any(h in q for h in ["help", "what can you", "who are you", "info", "what do you do"]):
-        return (
-            "I'm your **EV Assistant**! Here's what I can do:\n\n"
-            "• **Compare cars**: *compare Tesla Model 3 vs BMW i4*\n"
-            "• **Compare brands**: *Tesla vs BMW*\n"
-            "• **Car summary**: *tell me about Lucid Air*\n"
-            "• **Best in class**: *longest range*, *cheapest car*, *fastest 0-100*\n"
-            "• **Brand stats**: *best Tesla for towing*, *cheapest Porsche*\n"
-            "• **Dataset info**: *show summary*, *how many cars?*\n"
-            "• **List brands**: *brands*\n\n"
-            "Try any of these!"
-        )
-    if any(t in q for t in ["thanks", "thank you", "thankyou", "bye", "goodbye", "see you"]):
-        return random.choice([
-            "You're welcome! Charge safe!", "Happy to help!", "See you next time!"
-        ])
-    
-    # --- Data-Dependent Queries ---
-    
+    for pattern, handler in INTENT_TABLE:
+        if pattern.search(q):
+            return handler(q, df)
+
+    # --- Data-Dependent Queries (deterministic, memoized) ---
+    response = _answer_data_query(q, original_q, df)
+    if response is not None:
+        return response
+
+    # === FALLBACK (IMPROVED) ===
+    return _handle_fallback(q, df)
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def _answer_data_query(q, original_q, df):
+    """
+    The deterministic part of the chatbot: every answer here depends only
+    on the query and the dataset, so results are memoized and repeated
+    questions skip the pandas work entirely. Returns None when no intent
+    matches, letting the caller pick a varied fallback reply.
+    """
     # === LIST ALL BRANDS ===
-    if "brand" in q and any(x in q for x in ["list", "all", "available", "show"]):
-        brands = sorted(df['Brand'].unique())
-        return f"**Available Brands** ({len(brands)}):  \n`{', '.join(brands)}`"
+    if BRANDS_LIST_RE.search(q):
+        return _handle_brand_list(q, df)
 
     # === HOW MANY CARS? ===
     if "how many" in q and ("car" in q or "model" in q or "ev" in q):
-        return f"There are **{len(df)} EV models** in the database from **{len(df['Brand'].unique())} brands**."
+        return _handle_count(q, df)
 
     # === DATASET SUMMARY ===
     if any(s in q for s in ["summary", "stats", "overview", "dataset", "data info"]):
-        total = len(df)
-        brands = df['Brand'].nunique()
-        avg_price = df['Estimated_US_Value'].mean()
-        avg_range = df['km_of_range'].mean()
-        avg_battery = df['Battery'].mean()
+        stats = compute_summary_stats(df)
         return (
             f"### EV Dataset Summary\n\n"
-            f"**Total Models**: {total}\n"
-            f"**Brands**: {brands}\n"
-            f"**Avg Price**: `${avg_price:,.0f}`\n"
-            f"**Avg Range**: {avg_range:.0f} km\n"
-            f"**Avg Battery**: {avg_battery:.1f} kWh\n"
-            f"**Price Range**: `${df['Estimated_US_Value'].min():,.0f}` → `${df['Estimated_US_Value'].max():,.0f}`\n"
-            f"**Range Span**: {int(df['km_of_range'].min())} → {int(df['km_of_range'].max())} km"
+            f"**Total Models**: {stats['total']}\n"
+            f"**Brands**: {stats['brands']}\n"
+            f"**Avg Price**: `${stats['avg_price']:,.0f}`\n"
+            f"**Avg Range**: {stats['avg_range']:.0f} km\n"
+            f"**Avg Battery**: {stats['avg_battery']:.1f} kWh\n"
+            f"**Price Range**: `${stats['price_min']:,.0f}` → `${stats['price_max']:,.0f}`\n"
+            f"**Range Span**: {int(stats['range_min'])} → {int(stats['range_max'])} km"
         )
 
     # === BRAND DETECTION (FIXED) ===
-    all_brands_lower = [b.lower() for b in df['Brand'].unique()]
-    # --- FIX: changed .title() to .upper() to match the data
-    found_brands_in_query = list(set([b.upper() for b in all_brands_lower if b in q]))
+    found_brands_in_query = find_brands_in_query(q, df)
 
     # === BRAND-LEVEL COMPARISON ===
     if "vs" in q and len(found_brands_in_query) >= 2:
         b1, b2 = found_brands_in_query[0], found_brands_in_query[1]
-        df1 = df[df['Brand'] == b1]
-        df2 = df[df['Brand'] == b2]
-        
-        # Check for empty dataframes to avoid nan
-        if df1.empty or df2.empty:
-            missing_brand = b1 if df1.empty else b2
+        brand_stats_table = compute_brand_stats(df)
+
+        # Check for missing brands to avoid nan
+        if b1 not in brand_stats_table.index or b2 not in brand_stats_table.index:
+            missing_brand = b1 if b1 not in brand_stats_table.index else b2
             return f"Sorry, I don't have enough data for **{missing_brand}** to make a comparison."
 
-        def brand_stats(d):
+        def brand_stats(b):
+            row = brand_stats_table.loc[b]
             return {
-                'Models': len(d),
-                'Avg Price': f"${d['Estimated_US_Value'].mean():,.0f}",
-                'Avg Range': f"{d['km_of_range'].mean():.0f} km",
-                'Best Range': f"{d['km_of_range'].max()} km",
-                'Cheapest': f"${d['Estimated_US_Value'].min():,.0f}",
-                'Fastest 0-100': f"{d['0-100'].min()} sec"
+                'Models': int(row['Models']),
+                'Avg Price': f"${row['Avg_Price']:,.0f}",
+                'Avg Range': f"{row['Avg_Range']:.0f} km",
+                'Best Range': f"{row['Best_Range']:.0f} km",
+                'Cheapest': f"${row['Cheapest']:,.0f}",
+                'Fastest 0-100': f"{row['Fastest']:.1f} sec"
             }
-        s1, s2 = brand_stats(df1), brand_stats(df2)
+        s1, s2 = brand_stats(b1), brand_stats(b2)
         return (
             f"### Brand Comparison: **{b1}** vs **{b2}**\n\n"
             f"| Metric | **{b1}** | **{b2}** |\n"
@@ -227,7 +676,11 @@ def process_query(query, df):
 
     # === SET BRAND CONTEXT ===
     found_brand = found_brands_in_query[0] if len(found_brands_in_query) == 1 else None
-    df_context = df[df['Brand'] == found_brand] if found_brand else df
+    if found_brand:
+        idx = compute_brand_indices(df).get(found_brand)
+        df_context = df.take(idx) if idx is not None else df.iloc[0:0]
+    else:
+        df_context = df
     context = f"For **{found_brand}**" if found_brand else "Overall"
 
     # === CAR COMPARISON ===
@@ -280,7 +733,7 @@ def process_query(query, df):
             f"### {car['Brand']} {car['Model']}\n\n"
             f"• **Price**: `${car['Estimated_US_Value']:,.0f}`\n"
             f"• **Range**: {int(car['km_of_range'])} km\n"
-            f"• **0-100 km/h**: {car['0-100']} sec\n"
+            f"• **0-100 km/h**: {car['0-100']:.1f} sec\n"
             f"• **Top Speed**: {int(car['Top_Speed'])} km/h\n"
             f"• **Battery**: {car['Battery']:.1f} kWh\n"
             f"• **Efficiency**: {int(car['Efficiency'])} Wh/km\n"
@@ -289,35 +742,57 @@ def process_query(query, df):
         )
 
     # === EXTREME QUERIES (with brand context) ===
-    if ("longest" in q or "most" in q or "best" in q) and "range" in q:
-        car = df_context.loc[df_context['km_of_range'].idxmax()]
-        return f"{context}, the **{car['Brand']} {car['Model']}** has the longest range: **{int(car['km_of_range'])} km**."
-    if "cheapest" in q or ("lowest" in q and "price" in q):
-        valid = df_context[df_context['Estimated_US_Value'] > 0]
-        if valid.empty: return f"No priced cars found {context.lower()}."
-        car = valid.loc[valid['Estimated_US_Value'].idxmin()]
-        return f"{context}, the cheapest is **{car['Brand']} {car['Model']}** at **${car['Estimated_US_Value']:,.0f}**."
-    if ("fastest" in q or "quickest" in q) and ("0-100" in q or "acceleration" in q):
-        car = df_context.loc[df_context['0-100'].idxmin()]
-        return f"{context}, the fastest 0-100 is **{car['Brand']} {car['Model']}** in **{car['0-100']} sec**."
-    if "towing" in q and any(x in q for x in ["most", "highest", "best", "max"]):
-        car = df_context.loc[df_context['Towing_capacity_in_kg'].idxmax()]
-        return f"{context}, the **{car['Brand']} {car['Model']}** tows the most: **{int(car['Towing_capacity_in_kg'])} kg**."
+    # One regex pass tags the intent; both the global and the brand-scoped
+    # extremes come from precomputed tables.
+    extreme_match = EXTREME_RE.search(q)
+    if extreme_match:
+        extrema = compute_extrema(df)
+        brand_extrema = compute_brand_extrema(df) if found_brand else None
+        intent = extreme_match.lastgroup
+        if intent == 'range':
+            if found_brand:
+                car = df.loc[brand_extrema['range'][found_brand]]
+            else:
+                if extrema['longest_range'] is None: return f"No range data found {context.lower()}."
+                car = df.iloc[extrema['longest_range']]
+            return RANGE_TMPL.format(context, car['Brand'], car['Model'], car['km_of_range'])
+        if intent == 'cheapest':
+            if found_brand:
+                label = brand_extrema['cheapest'].get(found_brand)
+                if label is None: return f"No priced cars found {context.lower()}."
+                car = df.loc[label]
+            else:
+                if extrema['cheapest'] is None: return f"No priced cars found {context.lower()}."
+                car = df.iloc[extrema['cheapest']]
+            return CHEAPEST_TMPL.format(context, car['Brand'], car['Model'], car['Estimated_US_Value'])
+        if intent == 'fastest':
+            if found_brand:
+                car = df.loc[brand_extrema['fastest'][found_brand]]
+            else:
+                if extrema['fastest'] is None: return f"No 0-100 data found {context.lower()}."
+                car = df.iloc[extrema['fastest']]
+            return FASTEST_TMPL.format(context, car['Brand'], car['Model'], car['0-100'])
+        if intent == 'towing':
+            if found_brand:
+                car = df.loc[brand_extrema['towing'][found_brand]]
+            else:
+                if extrema['towing'] is None: return f"No towing data found {context.lower()}."
+                car = df.iloc[extrema['towing']]
+            return TOWING_TMPL.format(context, car['Brand'], car['Model'], car['Towing_capacity_in_kg'])
         
     # === BRAND SUMMARY (FIXED) ===
     if found_brand and len(q.split()) <= 3:
-        # --- FIX: Check if df_context is empty to prevent 'nan'
-        if df_context.empty:
+        brand_stats_table = compute_brand_stats(df)
+        # --- FIX: Check for a missing brand row to prevent 'nan'
+        if found_brand not in brand_stats_table.index:
             return f"Sorry, I couldn't find any models for **{found_brand}** in the data."
-            
-        count = len(df_context)
-        avg_price = df_context['Estimated_US_Value'].mean()
-        avg_range = df_context['km_of_range'].mean()
+
+        row = brand_stats_table.loc[found_brand]
         return (
-            f"**{found_brand}** has **{count} models**.\n"
-            f"• Avg Price: **${avg_price:,.0f}**\n"
-            f"• Avg Range: **{avg_range:.0f} km**\n"
-            f"• Price Range: `${df_context['Estimated_US_Value'].min():,.0f}` – `${df_context['Estimated_US_Value'].max():,.0f}`"
+            f"**{found_brand}** has **{int(row['Models'])} models**.\n"
+            f"• Avg Price: **${row['Avg_Price']:,.0f}**\n"
+            f"• Avg Range: **{row['Avg_Range']:.0f} km**\n"
+            f"• Price Range: `${row['Cheapest']:,.0f}` – `${row['Priciest']:,.0f}`"
         )
         
     # === AMBIGUITY HANDLERS ===
@@ -333,20 +808,67 @@ def process_query(query, df):
                "• *average range*\n" \
                "• *compare range of Model Y vs ID.4*"
 
-    # === FALLBACK (IMPROVED) ===
-    return random.choice([
-        "I'm not sure I understand. I'm best at specific questions! Try asking for:\n"
-        "• *compare Tesla vs BMW*\n"
-        "• *tell me about Model Y*\n"
-        "• *longest range Porsche*",
-        
-        "Hmm, I didn't catch that. You can ask me to **compare cars**, **summarize a model**, or find the **best/cheapest** car.",
-        
-        f"Sorry, I couldn't process that. Remember, I'm an EV expert! Try asking about the **{st.session_state.data_source}** data, like:\n"
-        "• *show summary*\n"
-        "• *how many cars are there?*\n"
-        "• *cheapest car*"
-    ])
+    # No deterministic intent matched
+    return None
+
+# ==============================
+# Visualization Figure Builders
+# ==============================
+# Cached per filtered frame: nudging a slider back to a previous setting
+# (or re-visiting a tab) reuses the stored figure instead of rebuilding
+# the Plotly spec from scratch.
+
+# Above this many points even WebGL scatters get heavy in the browser;
+# the Price vs Range tab falls back to a fixed-size density grid
+SCATTER_POINT_LIMIT = 5000
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_price_range_density_fig(filtered):
+    # Bins server-side and ships a small grid instead of one spec per
+    # point, so huge uploaded datasets stay responsive
+    return px.density_heatmap(filtered, x='km_of_range', y='Estimated_US_Value',
+                              nbinsx=60, nbinsy=60,
+                              labels={'km_of_range': 'Range (km)', 'Estimated_US_Value': 'Price (USD)'})
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_price_range_fig(filtered):
+    # render_mode='webgl': scattergl traces draw on the GPU, so redraws
+    # stay smooth even with a large uploaded dataset
+    return px.scatter(filtered, x='km_of_range', y='Estimated_US_Value', color='Brand', size='Battery',
+                      hover_data=['Model'], labels={'km_of_range': 'Range (km)', 'Estimated_US_Value': 'Price (USD)'},
+                      render_mode='webgl')
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_filtered_brand_agg(filtered):
+    """
+    Per-brand count and mean efficiency for the filtered frame, fused
+    into one groupby pass; the Brands and Efficiency tabs both read from
+    this table instead of sweeping the frame separately.
+    """
+    return filtered.groupby('Brand', observed=True, sort=False).agg(
+        count=('Model', 'size'),
+        Efficiency=('Efficiency', 'mean'),
+    )
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_brand_count_fig(filtered):
+    # Descending order, like value_counts rendered before the fused agg
+    counts = compute_filtered_brand_agg(filtered)['count'].sort_values(ascending=False).reset_index()
+    return px.bar(counts, x='Brand', y='count', color='count', title="Models per Brand (Filtered)")
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_performance_fig(filtered):
+    fig = px.scatter(filtered, x='0-100', y='Top_Speed', color='Brand', size='Estimated_US_Value',
+                     hover_data=['Model'], labels={'0-100': '0-100 (sec)', 'Top_Speed': 'Top Speed (km/h)'},
+                     render_mode='webgl')
+    fig.update_xaxes(autorange="reversed") # Faster 0-100 is better (lower number)
+    return fig
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_efficiency_fig(filtered):
+    eff = compute_filtered_brand_agg(filtered)['Efficiency'].sort_values().reset_index()
+    return px.bar(eff, x='Brand', y='Efficiency', color='Efficiency',
+                  color_continuous_scale='RdYlGn_r', title="Efficiency (Wh/km)")
 
 # ==============================
 # MAIN APP & DATA MANAGEMENT (Corrected)
@@ -378,21 +900,28 @@ st.sidebar.info("Upload a CSV to power the Chatbot and Visualizations.")
 
 uploaded_file = st.sidebar.file_uploader("Upload your own EV CSV", type="csv")
 if uploaded_file is not None:
-    try:
-        user_df = pd.read_csv(uploaded_file)
-        st.session_state.active_df = process_dataframe(user_df)
-        st.session_state.data_source = uploaded_file.name
-        st.toast(f"✅ Successfully loaded {uploaded_file.name}!")
-        if "messages" in st.session_state:
-            del st.session_state.messages
-    except Exception as e:
-        st.sidebar.error(f"Error reading file: {e}")
-        st.session_state.data_valid = False
+    # Streamlit reruns this block on every interaction while a file is
+    # selected; only parse the upload when a *new* file arrives, otherwise
+    # we re-read the CSV (and wipe the chat history) on every message.
+    upload_sig = (uploaded_file.name, uploaded_file.size)
+    if st.session_state.get('upload_sig') != upload_sig:
+        try:
+            user_df = pd.read_csv(uploaded_file)
+            st.session_state.active_df = process_dataframe(user_df)
+            st.session_state.data_source = uploaded_file.name
+            st.session_state.upload_sig = upload_sig
+            st.toast(f"✅ Successfully loaded {uploaded_file.name}!")
+            if "messages" in st.session_state:
+                del st.session_state.messages
+        except Exception as e:
+            st.sidebar.error(f"Error reading file: {e}")
+            st.session_state.data_valid = False
 
 if st.sidebar.button("Reset to Default Data"):
     default_df = load_default_data()
     st.session_state.active_df = process_dataframe(default_df)
     st.session_state.data_source = "Default Data"
+    st.session_state.pop('upload_sig', None)  # Allow re-uploading the same file
     st.toast("🔄 Reset to default dataset.")
     if "messages" in st.session_state:
         del st.session_state.messages
@@ -457,15 +986,14 @@ elif page == "🤖 EV Price Predictor":
 
     if st.button("Predict Price", type="primary", use_container_width=True):
         if model:
-            input_df = pd.DataFrame({
-                'Battery': [battery],
-                '0-100': [accel],
-                'Top_Speed': [top_speed],
-                'Range': [range_km],
-                'Efficiency': [efficiency],
-                'Number_of_seats': [seats]
-            })
-            pred = model.predict(input_df)[0]
+            # Reusable single-row buffer (feature order: Battery, 0-100,
+            # Top_Speed, Range, Efficiency, Number_of_seats) — skips the
+            # per-click DataFrame construction on the predict path
+            if 'predict_buf' not in st.session_state:
+                st.session_state.predict_buf = np.empty((1, 6), dtype=np.float32)
+            buf = st.session_state.predict_buf
+            buf[0, :] = (battery, accel, top_speed, range_km, efficiency, seats)
+            pred = model.predict(buf)[0]
             st.success(f"### Estimated Price: **${pred:,.0f}**")
             st.balloons()
         else:
@@ -490,13 +1018,7 @@ elif page == "💬 EV Data Chatbot":
         if "messages" not in st.session_state:
             st.session_state.messages = [{
                 "role": "assistant",
-                "content": (
-                    "Hi! I'm your **EV Expert**\n\n"
-                    "I'm ready to answer questions about the active dataset.\n"
-                    "• Try: *Tesla vs BMW*\n"
-                    "• Try: *compare Model 3 vs i4*\n"
-                    "• Try: *longest range*"
-                )
+                "content": WELCOME_MESSAGE
             }]
 
         # Display chat messages
@@ -534,32 +1056,30 @@ elif page == "📊 Data Visualization":
     elif df.empty:
         st.warning("No data loaded.")
     else:
-        viz_df = df[df['Estimated_US_Value'] > 0].copy()
-        
+        # All widget bounds/options come from the cached lookup; no
+        # per-rerun scans of the frame before filtering
+        options = compute_filter_options(df)
+
         # Filters
         with st.expander("Show Chart Filters", expanded=True):
             f_col1, f_col2 = st.columns(2)
             with f_col1:
-                brands = sorted(viz_df['Brand'].unique())
+                brands = options['brands']
                 sel_brands = st.multiselect("Brands", brands, default=brands[:5] if len(brands) > 5 else brands)
-                
-                all_seats = sorted(viz_df['Number_of_seats'].unique())
+
+                all_seats = options['seats']
                 sel_seats = st.multiselect("Seats", all_seats, default=all_seats)
-            
+
             with f_col2:
-                pmin, pmax = int(viz_df['Estimated_US_Value'].min()), int(viz_df['Estimated_US_Value'].max())
+                pmin, pmax = options['price']
                 sel_price = st.slider("Price", pmin, pmax, (pmin, pmax), step=1000, format="$%d")
 
-                rmin, rmax = int(viz_df['km_of_range'].min()), int(viz_df['km_of_range'].max())
+                rmin, rmax = options['range']
                 sel_range = st.slider("Range (km)", rmin, rmax, (rmin, rmax), step=10)
 
-        # Filter dataframe
-        filtered = viz_df[
-            viz_df['Brand'].isin(sel_brands) &
-            viz_df['Estimated_US_Value'].between(*sel_price) &
-            viz_df['km_of_range'].between(*sel_range) &
-            viz_df['Number_of_seats'].isin(sel_seats)
-        ]
+        # Filter dataframe (single fused pass over the full frame);
+        # selections go in as tuples so the cache key is stable
+        filtered = filter_viz_df(df, tuple(sel_brands), sel_price, sel_range, tuple(sel_seats))
 
         if filtered.empty:
             st.info("ℹ️ No cars match the current filters. Try expanding your filter selection.")
@@ -568,40 +1088,37 @@ elif page == "📊 Data Visualization":
             t1, t2, t3, t4, t5 = st.tabs(["Price vs Range", "Brands", "Performance", "Efficiency", "Top 10"])
             
             with t1:
-                st.subheader("Price vs. Range (Bubble Size by Battery)")
-                fig = px.scatter(filtered, x='km_of_range', y='Estimated_US_Value', color='Brand', size='Battery',
-                                 hover_data=['Model'], labels={'km_of_range': 'Range (km)', 'Estimated_US_Value': 'Price (USD)'})
-                st.plotly_chart(fig, use_container_width=True)
+                if len(filtered) > SCATTER_POINT_LIMIT:
+                    st.subheader("Price vs. Range (Density)")
+                    st.plotly_chart(build_price_range_density_fig(filtered), use_container_width=True)
+                else:
+                    st.subheader("Price vs. Range (Bubble Size by Battery)")
+                    st.plotly_chart(build_price_range_fig(filtered), use_container_width=True)
             with t2:
                 st.subheader("Model Count per Brand")
-                counts = filtered['Brand'].value_counts().reset_index()
-                fig = px.bar(counts, x='Brand', y='count', color='count', title="Models per Brand (Filtered)")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(build_brand_count_fig(filtered), use_container_width=True)
             with t3:
                 st.subheader("Performance: 0-100 vs. Top Speed")
-                fig = px.scatter(filtered, x='0-100', y='Top_Speed', color='Brand', size='Estimated_US_Value',
-                                 hover_data=['Model'], labels={'0-100': '0-100 (sec)', 'Top_Speed': 'Top Speed (km/h)'})
-                fig.update_xaxes(autorange="reversed") # Faster 0-100 is better (lower number)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(build_performance_fig(filtered), use_container_width=True)
             with t4:
                 st.subheader("Average Efficiency by Brand (Lower is Better)")
-                eff = filtered.groupby('Brand')['Efficiency'].mean().sort_values().reset_index()
-                fig = px.bar(eff, x='Brand', y='Efficiency', color='Efficiency',
-                             color_continuous_scale='RdYlGn_r', title="Efficiency (Wh/km)")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(build_efficiency_fig(filtered), use_container_width=True)
             with t5:
                 st.subheader("Top 10 Lists")
                 c1, c2 = st.columns(2)
                 with c1:
                     st.markdown("#### Most Expensive")
-                    top_price = filtered.nlargest(10, 'Estimated_US_Value')[['Brand', 'Model', 'Estimated_US_Value']]
-                    top_price['Estimated_US_Value'] = top_price['Estimated_US_Value'].map('${:,.0f}'.format)
-                    st.dataframe(top_price, use_container_width=True, hide_index=True)
+                    top_price = top_k_rows(filtered, 'Estimated_US_Value')[['Brand', 'Model', 'Estimated_US_Value']]
+                    # Round once vectorized; per-row work is just the thousands separator
+                    top_price['Estimated_US_Value'] = '$' + top_price['Estimated_US_Value'].round().astype('int64').map('{:,}'.format)
+                    # Static 10-row table: plain HTML skips the grid
+                    # widget's JS boot on every tab switch
+                    st.markdown(top_price.to_html(index=False), unsafe_allow_html=True)
                 with c2:
                     st.markdown("#### Longest Range")
-                    top_range = filtered.nlargest(10, 'km_of_range')[['Brand', 'Model', 'km_of_range']]
-                    top_range['km_of_range'] = top_range['km_of_range'].map('{:,.0f} km'.format)
-                    st.dataframe(top_range, use_container_width=True, hide_index=True)
+                    top_range = top_k_rows(filtered, 'km_of_range')[['Brand', 'Model', 'km_of_range']]
+                    top_range['km_of_range'] = top_range['km_of_range'].round().astype('int64').map('{:,}'.format) + ' km'
+                    st.markdown(top_range.to_html(index=False), unsafe_allow_html=True)
             
             # --- Summary Metrics ---
             st.markdown("---")
@@ -1,39 +1,54 @@
 import pandas as pd
 import joblib
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
 
-# 1. Load the dataset
-# Ensure 'cars_data_cleaned.csv' is in the same folder
-df = pd.read_csv('cars_data_cleaned.csv')
-
-# 2. Define Features and Target
+# 1. Define Features and Target
 # We use numeric features that are available in the user input
 features = ['Battery', '0-100', 'Top_Speed', 'Range', 'Efficiency', 'Number_of_seats']
 target = 'Estimated_US_Value'  # Using US Value as the target price
 
-X = df[features]
-y = df[target]
+# 2. Load the dataset
+# Ensure 'cars_data_cleaned.csv' is in the same folder.
+# Only the needed columns are parsed, straight into compact numeric
+# dtypes — no inference pass over the unused price/text columns.
+dtype_map = {
+    'Battery': 'float32',
+    '0-100': 'float32',
+    'Top_Speed': 'float32',
+    'Range': 'float32',
+    'Efficiency': 'float32',
+    'Number_of_seats': 'uint8',
+    'Estimated_US_Value': 'float32',
+}
+df = pd.read_csv('cars_data_cleaned.csv', usecols=list(dtype_map),
+                 dtype=dtype_map, engine='pyarrow')
+
+X = df[features].to_numpy()
+y = df[target].to_numpy()
 
 # 3. Split the data (Optional for final training, but good for validation)
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# 4. Create a Pipeline (Scaler + Model)
-# This ensures input data is scaled exactly like the training data
-pipeline = Pipeline([
-    ('scaler', StandardScaler()),
-    ('model', RandomForestRegressor(n_estimators=100, random_state=42))
-])
+# 4. Create the model
+# Histogram gradient boosting bins features once and finds splits on the
+# bins, so training is far cheaper than an exact-split forest. Tree
+# splits are scale-invariant, so no StandardScaler step is needed.
+model = HistGradientBoostingRegressor(
+    max_iter=200,
+    learning_rate=0.05,
+    max_bins=255,
+    early_stopping=True,
+    random_state=42,
+)
 
 # 5. Train the model
-pipeline.fit(X_train, y_train)
+model.fit(X_train, y_train)
 
 # 6. Evaluate (Optional)
-score = pipeline.score(X_test, y_test)
+score = model.score(X_test, y_test)
 print(f"Model R² Score: {score:.3f}")
 
-# 7. Save the trained pipeline
-joblib.dump(pipeline, 'model.pkl')
+# 7. Save the trained model
+joblib.dump(model, 'model.pkl', compress=3)
 print("✅ Model saved as 'model.pkl'")